@@ -139,6 +139,7 @@ class ModCommands(commands.Cog):
                 playtest.thread_id,
                 playtest.original_msg,
             )
+            utils.schedule_completions_refresh(itx.client)
         else:
             itx.client.dispatch("newsfeed_medals", itx, map_code, gold, silver, bronze)
             await utils.update_affected_users(itx.client, map_code)
@@ -257,7 +258,8 @@ class ModCommands(commands.Cog):
         )
 
         await member.send(f"Your record for {map_code} has been deleted by staff.")
-        await utils.auto_role(itx.client, member)
+        await utils.auto_role(itx.client, member, live=True)
+        utils.schedule_completions_refresh(itx.client)
 
     @mod.command(name="change-name")
     @app_commands.autocomplete(member=cogs.users_autocomplete)
@@ -474,6 +476,7 @@ class ModCommands(commands.Cog):
             value,
             map_code,
         )
+        utils.schedule_completions_refresh(itx.client)
         await itx.edit_original_response(
             content=f"**{map_code}** has been {action.value}d."
         )
@@ -554,6 +557,7 @@ class ModCommands(commands.Cog):
                 playtest.thread_id,
                 playtest.original_msg,
             )
+            utils.schedule_completions_refresh(itx.client)
         else:
             await utils.update_affected_users(itx.client, map_code)
             itx.client.dispatch(
@@ -1059,6 +1063,7 @@ class ModCommands(commands.Cog):
         await self._insert_legacy_records(record_tuples)
         await self._update_records_to_completions(map_code)
         await self._remove_medal_entries(map_code)
+        utils.schedule_completions_refresh(itx.client)
 
         embed = utils.GenjiEmbed(
             title=f"{map_code} has been changed:",
@@ -28,7 +28,15 @@ class Tags(discord.ext.commands.GroupCog, group_name="tag"):
         """View a tag."""
         await itx.response.defer()
         if name not in itx.client.cache.tags.list:
-            fuzzed_options = utils.fuzz_multiple(name, itx.client.cache.tags.list)
+            fuzzed_options = utils.fuzz_multiple(name, itx.client.cache.tags)
+            if not fuzzed_options:
+                await itx.edit_original_response(
+                    embed=utils.GenjiEmbed(
+                        title="Tags",
+                        description=f"Couldn't find `{name}`.",
+                    )
+                )
+                return
             fuzz_desc = [
                 f"{views.NUMBER_EMOJI[i + 1]} - {x}\n"
                 for i, x in enumerate(fuzzed_options)
@@ -18,6 +18,7 @@ class Tasks(commands.Cog):
         self._playtest_auto_approve.start()
         self._playtest_expiration_warning.start()
         self._playtest_expiration.start()
+        self._refresh_completions.start()
 
     @tasks.loop(time=[datetime.time(0, 0, 0), datetime.time(12, 0, 0)])
     async def _playtest_auto_approve(self):
@@ -137,6 +138,14 @@ SELECT ap.map_code, ap.user_id, thread_id, message_id
             map_codes,
         )
 
+    @tasks.loop(minutes=5)
+    async def _refresh_completions(self):
+        # Safety net for writes that neither schedule a refresh nor update ranks.
+        try:
+            await utils.refresh_completions_view(self.bot)
+        except Exception:
+            self.bot.logger.exception("Failed to refresh user_map_completions.")
+
     @tasks.loop(hours=24, count=1)
     async def cache(self):
         maps = [
@@ -33,6 +33,7 @@ class BotEvents(commands.Cog):
         Args:
             self: Bot instance
         """
+        utils.clear_newsfeed_channel()
         app_info = await self.bot.application_info()
         self.bot.logger.info(
             f"{ASCII_LOGO}"
@@ -46,6 +46,7 @@ class Genji(commands.Bot):
         the initial_extensions list. This function is also used
         to start a connection with the database,
         and register any tasks that need to be run on a loop.
+        It also creates the user_map_completions materialized view.
 
         Args:
             self: bot instance
@@ -54,6 +55,8 @@ class Genji(commands.Bot):
             None
         """
 
+        await utils.setup_completions_view(self)
+
         for ext in cogs.EXTENSIONS + ["jishaku", "core.events"]:
             self.logger.info(f"Loading {ext}...")
             await self.load_extension(ext)
@@ -1,3 +1,4 @@
+import contextlib
 import logging
 import textwrap
 import typing
@@ -70,16 +71,52 @@ class Database:
                 ):
                     yield record
 
+    async def fetch_all(self, query: str, *args: typing.Any) -> list[DotRecord]:
+        """
+        Fetches every row of a query in a single round trip.
+        Args:
+            query (str) Specify the query that will be executed
+            *args (Any) Pass in any additional arguments that are
+                needed to be passed into the query
+        Returns:
+            list of DotRecords
+        """
+        if self.pool is None:
+            raise utils.DatabaseConnectionError()
+        query = textwrap.dedent(query)
+        self.logger.debug(query)
+        self.logger.debug(args)
+
+        async with self.pool.acquire() as conn:
+            return await conn.fetch(query, *args, record_class=DotRecord)
+
     async def get_row(self, query: str, *args: typing.Any) -> DotRecord | None:
         res = [x async for x in self.get(query, *args)]
         if res:
             res = res[0]
         return res
 
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> typing.AsyncIterator[asyncpg.Connection]:
+        """
+        Acquire a single connection and open a transaction on it.
+        Pass the yielded connection to set/set_many so several
+        queries share one connection and commit together.
+        Yields:
+            asyncpg.Connection
+        """
+        if self.pool is None:
+            raise utils.DatabaseConnectionError()
+
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                yield conn
+
     async def set(
         self,
         query: str,
         *args: typing.Any,
+        connection: asyncpg.Connection | None = None,
     ):
         """
         The set_query_handler function takes a query string
@@ -89,18 +126,21 @@ class Database:
         Args:
             query (str) Store the query string
             *args (Any) Pass any additional arguments to the query
+            connection (asyncpg.Connection | None) Run on an already open
+                transaction instead of acquiring a new connection
         """
-        if self.pool is None:
-            raise utils.DatabaseConnectionError()
+        if connection is not None:
+            await connection.execute(query, *args)
+            return
 
-        async with self.pool.acquire() as conn:
-            async with conn.transaction():
-                await conn.execute(query, *args)
+        async with self.transaction() as conn:
+            await conn.execute(query, *args)
 
     async def set_many(
         self,
         query: str,
         *args: typing.Any,
+        connection: asyncpg.Connection | None = None,
     ):
         """
         The set_query_handler function takes a query string
@@ -110,10 +150,12 @@ class Database:
         Args:
             query (str) Store the query string
             *args (Any) Pass any additional arguments to the query
+            connection (asyncpg.Connection | None) Run on an already open
+                transaction instead of acquiring a new connection
         """
-        if self.pool is None:
-            raise utils.DatabaseConnectionError()
+        if connection is not None:
+            await connection.executemany(query, *args)
+            return
 
-        async with self.pool.acquire() as conn:
-            async with conn.transaction():
-                await conn.executemany(query, *args)
+        async with self.transaction() as conn:
+            await conn.executemany(query, *args)
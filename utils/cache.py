@@ -210,6 +210,7 @@ class SequenceCache(Generic[T]):
                 raise AlreadyExists
             _objs.append(obj)
         self.values.extend(_objs)
+        self._changed()
 
     def remove_one(self, key: str | int):
         """Remove an object (T) from the SequenceCache."""
@@ -218,10 +219,15 @@ class SequenceCache(Generic[T]):
         found = self.find(key)
         if found:
             self.values.remove(found)
+            self._changed()
 
     def clear_all(self):
         """Clear all objects in a SequenceCache."""
         self.values = []
+        self._changed()
+
+    def _changed(self) -> None:
+        """Called after objects are added to or removed from the SequenceCache."""
 
     def find(self, key: int | str) -> T:
         """Find a value using its key in the SequenceCache."""
@@ -272,6 +278,9 @@ class Maps(SequenceCache[MapData]):
 class StrCacheSequence(SequenceCache[T]):
     def __init__(self):
         self.key_value = "value"
+        self._list: tuple[str, ...] | None = None
+        self._normalized: tuple[str, ...] | None = None
+        self.version = 0
         super().__init__(self.key_value)
 
     @property
@@ -280,9 +289,24 @@ class StrCacheSequence(SequenceCache[T]):
         return [x.option for x in self.values]
 
     @property
-    def list(self) -> list[str]:
-        """List of string values in a StrCacheSequence"""
-        return [x.value for x in self.values]
+    def list(self) -> tuple[str, ...]:
+        """Tuple of string values in a StrCacheSequence"""
+        if self._list is None:
+            self._list = tuple(x.value for x in self.values)
+        return self._list
+
+    @property
+    def normalized(self) -> tuple[str, ...]:
+        """Tuple of casefolded string values, index aligned with list"""
+        if self._normalized is None:
+            self._normalized = tuple(x.casefold() for x in self.list)
+        return self._normalized
+
+    def _changed(self) -> None:
+        """Drop the cached tuples of string values and bump the version."""
+        self._list = None
+        self._normalized = None
+        self.version += 1
 
     def __iter__(self) -> Iterable[str]:
         return iter(self.values)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import dataclasses
-import re
+import operator
+import string
 import typing
 
 import discord
@@ -11,38 +12,43 @@ import database
 import utils
 
 if typing.TYPE_CHECKING:
+    import asyncpg
+
     import core
 
 
-class MapNameTransformer(app_commands.Transformer):
-    async def transform(self, itx: discord.Interaction[core.Genji], value: str) -> str:
-        if value not in itx.client.cache.map_names:
-            value = utils.fuzz_(value, itx.client.cache.map_names.list)
-        return value
+class _StrCacheTransformer(app_commands.Transformer):
+    """Fuzz values that aren't an exact match for a StrCacheSequence."""
 
+    get_values: typing.Callable[[utils.GenjiCache], utils.StrCacheSequence]
 
-class MapTypeTransformer(app_commands.Transformer):
     async def transform(self, itx: discord.Interaction[core.Genji], value: str) -> str:
-        if value not in itx.client.cache.map_types:
-            value = utils.fuzz_(value, itx.client.cache.map_types.list)
+        values = self.get_values(itx.client.cache)
+        if value not in values.list:
+            value = utils.fuzz_(value, values)
         return value
 
 
-class MapMechanicsTransformer(app_commands.Transformer):
-    async def transform(self, itx: discord.Interaction[core.Genji], value: str) -> str:
-        if value not in itx.client.cache.map_mechanics.list:
-            value = utils.fuzz_(value, itx.client.cache.map_mechanics.list)
-        return value
+class MapNameTransformer(_StrCacheTransformer):
+    get_values = operator.attrgetter("map_names")
 
 
-class MapRestrictionsTransformer(app_commands.Transformer):
-    async def transform(self, itx: discord.Interaction[core.Genji], value: str) -> str:
-        if value not in itx.client.cache.map_restrictions.list:
-            value = utils.fuzz_(value, itx.client.cache.map_restrictions.list)
-        return value
+class MapTypeTransformer(_StrCacheTransformer):
+    get_values = operator.attrgetter("map_types")
+
+
+class MapMechanicsTransformer(_StrCacheTransformer):
+    get_values = operator.attrgetter("map_mechanics")
+
 
+class MapRestrictionsTransformer(_StrCacheTransformer):
+    get_values = operator.attrgetter("map_restrictions")
 
-@dataclasses.dataclass
+
+_DIFFICULTY_MODIFIERS_TABLE = str.maketrans("", "", "+-")
+
+
+@dataclasses.dataclass(slots=True)
 class MapSubmission:
     creator: discord.Member | utils.FakeUser
     map_code: str
@@ -57,6 +63,16 @@ class MapSubmission:
     restrictions: list[str] | None = None
     difficulty: str | None = None  # base difficulty
 
+    _difficulty_value: float | None = dataclasses.field(
+        default=None, init=False, repr=False
+    )
+    _base_difficulty: str | None = dataclasses.field(
+        default=None, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        self._normalize()
+
     def __str__(self):
         return utils.Formatter(self.to_dict()).format_map()
 
@@ -74,30 +90,46 @@ class MapSubmission:
             "Desc": self.description,
         }
 
+    def _normalize(self):
+        """Remove nulls from the list fields so the formatters don't have to.
+        Also precompute the lookups derived from difficulty."""
+        self.map_types = self._remove_nulls(self.map_types)
+        self.mechanics = self._remove_nulls(self.mechanics)
+        self.restrictions = self._remove_nulls(self.restrictions)
+        if self.difficulty:
+            self._difficulty_value = utils.DIFFICULTIES_RANGES[self.difficulty][0]
+            self._base_difficulty = self.difficulty.translate(
+                _DIFFICULTY_MODIFIERS_TABLE
+            ).rstrip()
+        else:
+            self._difficulty_value = None
+            self._base_difficulty = None
+
     @staticmethod
     def _remove_nulls(sequence):
-        return [x for x in sequence if x is not None]
+        return [x for x in sequence or () if x is not None]
+
+    @property
+    def difficulty_value(self) -> float | None:
+        """Lower bound of the difficulty's range, e.g. for ratings."""
+        return self._difficulty_value
+
+    @property
+    def base_difficulty(self) -> str | None:
+        """Difficulty without its +/- modifier, e.g. "Very Hard"."""
+        return self._base_difficulty
 
     @property
     def mechanics_str(self):
-        self.mechanics = self._remove_nulls(self.mechanics)
-        if self.mechanics:
-            return ", ".join(self.mechanics)
-        return None
+        return ", ".join(self.mechanics) if self.mechanics else None
 
     @property
     def restrictions_str(self):
-        self.restrictions = self._remove_nulls(self.restrictions)
-        if self.restrictions:
-            return ", ".join(self.restrictions)
-        return None
+        return ", ".join(self.restrictions) if self.restrictions else None
 
     @property
     def map_types_str(self):
-        self.map_types = self._remove_nulls(self.map_types)
-        if self.map_types:
-            return ", ".join(self.map_types)
-        return None
+        return ", ".join(self.map_types) if self.map_types else None
 
     @property
     def gold(self):
@@ -119,11 +151,11 @@ class MapSubmission:
 
     @property
     def guide_str(self):
-        all_guides = []
-        for count, link in enumerate(self.guides, start=1):
-            if link:
-                all_guides.append(f"[Link {count}]({link})")
-        return ", ".join(all_guides)
+        return ", ".join(
+            f"[Link {count}]({link})"
+            for count, link in enumerate(self.guides or (), start=1)
+            if link
+        )
 
     @property
     def medals_str(self):
@@ -145,6 +177,7 @@ class MapSubmission:
     def set_extras(self, **args):
         for k, v in args.items():
             setattr(self, k, v)
+        self._normalize()
 
     async def insert_playtest(
         self,
@@ -162,12 +195,17 @@ class MapSubmission:
             thread_msg_id,
             self.map_code,
             itx.user.id,
-            utils.DIFFICULTIES_RANGES[self.difficulty][0],
+            self.difficulty_value,
             True,
             new_map_id,
         )
 
-    async def insert_maps(self, itx: discord.Interaction[core.Genji], mod: bool):
+    async def insert_maps(
+        self,
+        itx: discord.Interaction[core.Genji],
+        mod: bool,
+        conn: asyncpg.Connection | None = None,
+    ):
         await itx.client.database.set(
             """
             INSERT INTO 
@@ -180,9 +218,14 @@ class MapSubmission:
             self.description,
             mod,
             self.checkpoint_count,
+            connection=conn,
         )
 
-    async def insert_mechanics(self, itx: discord.Interaction[core.Genji]):
+    async def insert_mechanics(
+        self,
+        itx: discord.Interaction[core.Genji],
+        conn: asyncpg.Connection | None = None,
+    ):
         mechanics = [(self.map_code, x) for x in self.mechanics]
         await itx.client.database.set_many(
             """
@@ -190,9 +233,14 @@ class MapSubmission:
             VALUES ($1, $2);
             """,
             mechanics,
+            connection=conn,
         )
 
-    async def insert_restrictions(self, itx: discord.Interaction[core.Genji]):
+    async def insert_restrictions(
+        self,
+        itx: discord.Interaction[core.Genji],
+        conn: asyncpg.Connection | None = None,
+    ):
         restrictions = [(self.map_code, x) for x in self.restrictions]
         await itx.client.database.set_many(
             """
@@ -200,9 +248,14 @@ class MapSubmission:
             VALUES ($1, $2);
             """,
             restrictions,
+            connection=conn,
         )
 
-    async def insert_map_creators(self, itx: discord.Interaction[core.Genji]):
+    async def insert_map_creators(
+        self,
+        itx: discord.Interaction[core.Genji],
+        conn: asyncpg.Connection | None = None,
+    ):
         await itx.client.database.set(
             """
             INSERT INTO map_creators (map_code, user_id) 
@@ -210,9 +263,14 @@ class MapSubmission:
             """,
             self.map_code,
             self.creator.id,
+            connection=conn,
         )
 
-    async def insert_map_ratings(self, itx: discord.Interaction[core.Genji]):
+    async def insert_map_ratings(
+        self,
+        itx: discord.Interaction[core.Genji],
+        conn: asyncpg.Connection | None = None,
+    ):
         await itx.client.database.set(
             """
             INSERT INTO map_ratings (map_code, user_id, difficulty) 
@@ -220,18 +278,28 @@ class MapSubmission:
             """,
             self.map_code,
             self.creator.id,
-            utils.DIFFICULTIES_RANGES[self.difficulty][0],
+            self.difficulty_value,
+            connection=conn,
         )
 
-    async def insert_guide(self, itx: discord.Interaction[core.Genji]):
+    async def insert_guide(
+        self,
+        itx: discord.Interaction[core.Genji],
+        conn: asyncpg.Connection | None = None,
+    ):
         _guides = [(self.map_code, guide) for guide in self.guides if guide]
         if _guides:
             await itx.client.database.set_many(
                 """INSERT INTO guides (map_code, url) VALUES ($1, $2);""",
                 _guides,
+                connection=conn,
             )
 
-    async def insert_medals(self, itx: discord.Interaction[core.Genji]):
+    async def insert_medals(
+        self,
+        itx: discord.Interaction[core.Genji],
+        conn: asyncpg.Connection | None = None,
+    ):
         if self.medals:
             await itx.client.database.set(
                 """
@@ -242,9 +310,15 @@ class MapSubmission:
                 self.silver,
                 self.bronze,
                 self.map_code,
+                connection=conn,
             )
 
-    async def insert_timestamp(self, itx: discord.Interaction[core.Genji], mod: bool):
+    async def insert_timestamp(
+        self,
+        itx: discord.Interaction[core.Genji],
+        mod: bool,
+        conn: asyncpg.Connection | None = None,
+    ):
         if not mod:
             await itx.client.database.set(
                 """
@@ -253,63 +327,63 @@ class MapSubmission:
                 """,
                 self.creator.id,
                 self.map_code,
+                connection=conn,
             )
 
     async def insert_all(self, itx: discord.Interaction[core.Genji], mod: bool):
-        await self.insert_maps(itx, mod)
-        await self.insert_mechanics(itx)
-        await self.insert_restrictions(itx)
-        await self.insert_map_creators(itx)
-        await self.insert_map_ratings(itx)
-        await self.insert_guide(itx)
-        await self.insert_medals(itx)
-        await self.insert_timestamp(itx, mod)
+        async with itx.client.database.transaction() as conn:
+            await self.insert_maps(itx, mod, conn)
+            await self.insert_mechanics(itx, conn)
+            await self.insert_restrictions(itx, conn)
+            await self.insert_map_creators(itx, conn)
+            await self.insert_map_ratings(itx, conn)
+            await self.insert_guide(itx, conn)
+            await self.insert_medals(itx, conn)
+            await self.insert_timestamp(itx, mod, conn)
 
 
 async def get_map_info(
     client: core.Genji, message_id: int | None = None
 ) -> list[database.DotRecord | None]:
-    return [
-        x
-        async for x in client.database.get(
-            """
-            SELECT map_name,
-                   map_type,
-                   m.map_code,
-                   "desc",
-                   official,
-                   archived,
-                   AVG(value) as value,
-                   array_agg(DISTINCT url)              AS guide,
-                   array_agg(DISTINCT mech.mechanic)    AS mechanics,
-                   array_agg(DISTINCT rest.restriction) AS restrictions,
-                   checkpoints,
-                   array_agg(DISTINCT mc.user_id)       AS creator_ids,
-                   gold,
-                   silver,
-                   bronze,
-                   p.message_id
-            FROM playtest p
-                     LEFT JOIN maps m on m.map_code = p.map_code
-                     LEFT JOIN map_mechanics mech on mech.map_code = m.map_code
-                     LEFT JOIN map_restrictions rest on rest.map_code = m.map_code
-                     LEFT JOIN map_creators mc on m.map_code = mc.map_code
-                     LEFT JOIN users u on mc.user_id = u.user_id
-                     LEFT JOIN guides g on m.map_code = g.map_code
-                     LEFT JOIN map_medals mm on m.map_code = mm.map_code
-            WHERE is_author = TRUE AND ($1::bigint IS NULL OR $1::bigint = p.message_id)
-            GROUP BY checkpoints, map_name,
-                     m.map_code, "desc", official, map_type, gold, silver, bronze, archived, p.message_id
-            """,
-            message_id,
-        )
-    ]
+    return await client.database.fetch_all(
+        """
+        SELECT map_name,
+               map_type,
+               m.map_code,
+               "desc",
+               official,
+               archived,
+               AVG(value) as value,
+               array_agg(DISTINCT url)              AS guide,
+               array_agg(DISTINCT mech.mechanic)    AS mechanics,
+               array_agg(DISTINCT rest.restriction) AS restrictions,
+               checkpoints,
+               array_agg(DISTINCT mc.user_id)       AS creator_ids,
+               gold,
+               silver,
+               bronze,
+               p.message_id
+        FROM playtest p
+                 LEFT JOIN maps m on m.map_code = p.map_code
+                 LEFT JOIN map_mechanics mech on mech.map_code = m.map_code
+                 LEFT JOIN map_restrictions rest on rest.map_code = m.map_code
+                 LEFT JOIN map_creators mc on m.map_code = mc.map_code
+                 LEFT JOIN users u on mc.user_id = u.user_id
+                 LEFT JOIN guides g on m.map_code = g.map_code
+                 LEFT JOIN map_medals mm on m.map_code = mm.map_code
+        WHERE is_author = TRUE AND ($1::bigint IS NULL OR $1::bigint = p.message_id)
+        GROUP BY checkpoints, map_name,
+                 m.map_code, "desc", official, map_type, gold, silver, bronze, archived, p.message_id
+        """,
+        message_id,
+    )
 
 
 _MAPS_BASE_URL = "http://207.244.249.145/assets/images/map_banners/"
+_EXTRA_CHARS_TABLE = str.maketrans("", "", string.whitespace + ":()'")
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class MapMetadata:
     NAME: str
     COLOR: discord.Color
@@ -318,8 +392,9 @@ class MapMetadata:
     def __post_init__(self):
         self.IMAGE_URL = _MAPS_BASE_URL + self._remove_extra_chars(self.NAME) + ".png"
 
-    def _remove_extra_chars(self, string: str):
-        return re.sub(r"[\s:()\']", "", string.lower())
+    @staticmethod
+    def _remove_extra_chars(value: str):
+        return value.lower().translate(_EXTRA_CHARS_TABLE)
 
 
 all_map_constants = [
@@ -381,7 +456,15 @@ all_map_constants = [
     MapMetadata("Lijiang Tower (Lunar New Year)", discord.Color.from_str("#169900")),
 ]
 
-MAP_DATA: dict[str, MapMetadata] = {const.NAME: const for const in all_map_constants}
+
+def _map_data_key(map_name: str) -> str:
+    """Normalize a map name for MAP_DATA lookups."""
+    return map_name.casefold().strip()
+
+
+MAP_DATA: dict[str, MapMetadata] = {
+    _map_data_key(const.NAME): const for const in all_map_constants
+}
 
 DIFF_TO_RANK = {
     "Beginner": "Ninja",
@@ -394,27 +477,40 @@ DIFF_TO_RANK = {
 }
 
 
+_newsfeed_channel: discord.TextChannel | None = None
+
+
+def get_newsfeed_channel(client: core.Genji) -> discord.TextChannel:
+    """Get the newsfeed channel, resolving it from the guild on first use."""
+    global _newsfeed_channel
+    if _newsfeed_channel is None:
+        _newsfeed_channel = client.get_guild(utils.GUILD_ID).get_channel(utils.NEWSFEED)
+    return _newsfeed_channel
+
+
+def clear_newsfeed_channel() -> None:
+    """Forget the cached newsfeed channel, e.g. after a reconnect."""
+    global _newsfeed_channel
+    _newsfeed_channel = None
+
+
 async def new_map_newsfeed(
     client: core.Genji,
     user_id: int,
     data: utils.MapSubmission,
 ):
     nickname = client.cache.users[user_id].nickname
+    metadata = MAP_DATA.get(_map_data_key(data.map_name))
     embed = utils.GenjiEmbed(
         title=f"{nickname} has submitted a new {data.difficulty} map on {data.map_name}!\n",
         description=(
             f"Use the command `/map-search map_code:{data.map_code}` to see the details!"
         ),
-        color=getattr(
-            MAP_DATA.get(data.map_name, discord.Color.from_str("#000000")),
-            "COLOR",
-            discord.Color.from_str("#000000"),
-        ),
+        color=metadata.COLOR if metadata else discord.Color.from_str("#000000"),
     )
-    embed.set_image(url=getattr(MAP_DATA.get(data.map_name, None), "IMAGE_URL", None))
+    embed.set_image(url=metadata.IMAGE_URL if metadata else None)
     base_thumbnail_url = "http://207.244.249.145/assets/images/genji_ranks/"
-    rank = DIFF_TO_RANK[
-        data.difficulty.replace("+", "").replace("-", "").rstrip()
-    ].lower()
-    embed.set_thumbnail(url=f"{base_thumbnail_url}{rank}.png")
-    await client.get_guild(utils.GUILD_ID).get_channel(utils.NEWSFEED).send(embed=embed)
+    if data.base_difficulty:
+        rank = DIFF_TO_RANK[data.base_difficulty].lower()
+        embed.set_thumbnail(url=f"{base_thumbnail_url}{rank}.png")
+    await get_newsfeed_channel(client).send(embed=embed)
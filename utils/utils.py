@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
-import operator
+import functools
+import heapq
+import itertools
 import re
 import typing
 
 import discord
-from thefuzz import fuzz
+from rapidfuzz import fuzz, process
+from rapidfuzz.distance import Indel
 
 import utils
 import views
@@ -16,35 +19,96 @@ if typing.TYPE_CHECKING:
     import core
 
 
+_pending_deletes: list[tuple[float, int, discord.Interaction[core.Genji]]] = []
+_pending_deletes_counter = itertools.count()  # Tie-breaker so itx is never compared
+_pending_deletes_wakeup: asyncio.Event | None = None  # Created with the worker
+_delete_worker: asyncio.Task | None = None
+
+
 async def delete_interaction(
     itx: discord.Interaction[core.Genji], *, minutes: int | float
 ):
-    """Delete an itx message after x minutes. Fails silently.
+    """Schedule an itx message to be deleted after x minutes. Fails silently.
+    Returns immediately, a single worker task handles every pending delete.
     Args:
         itx (discord.Interaction): Interaction to find original message.
         minutes (int): Minutes (use 0 for no delay)
     """
+    global _delete_worker, _pending_deletes_wakeup
     if minutes < 0:
         raise ValueError("Time cannot be negative.")
-    await asyncio.sleep(60 * minutes)
-    with contextlib.suppress(
-        discord.HTTPException, discord.NotFound, discord.Forbidden
-    ):
-        await itx.delete_original_response()
+    deadline = asyncio.get_running_loop().time() + 60 * minutes
+    heapq.heappush(_pending_deletes, (deadline, next(_pending_deletes_counter), itx))
+    if _delete_worker is None or _delete_worker.done():
+        _pending_deletes_wakeup = asyncio.Event()
+        _delete_worker = asyncio.create_task(
+            _delete_interactions_worker(_pending_deletes_wakeup)
+        )
+    else:
+        _pending_deletes_wakeup.set()
+
+
+async def _delete_interactions_worker(wakeup: asyncio.Event):
+    """Delete pending itx messages as their deadlines pass.
+    Exits once nothing is pending. A failed delete is logged and skipped."""
+    loop = asyncio.get_running_loop()
+    while _pending_deletes:
+        deadline, _, itx = _pending_deletes[0]
+        delay = deadline - loop.time()
+        if delay > 0:
+            # Wake early if a delete with a sooner deadline is scheduled.
+            wakeup.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(wakeup.wait(), delay)
+            continue
+        heapq.heappop(_pending_deletes)
+        try:
+            await itx.delete_original_response()
+        except discord.HTTPException:
+            pass
+        except Exception:
+            itx.client.logger.exception("Failed to delete interaction response.")
+
+
+_FUZZ_MULTIPLE_SCORE_CUTOFF = 40
+_FUZZ_MULTIPLE_LIMIT = 10
+
+
+def fuzz_(string: str, values: utils.StrCacheSequence) -> str:
+    """Fuzz a value.
+    Matching is case-insensitive and runs against the cache's normalized values.
+    Always returns the best match.
+    """
+    return _fuzz_cached(string.casefold(), values, values.version)
 
 
-def fuzz_(string: str, iterable: typing.Iterable[str]) -> str:
-    """Fuzz a value."""
-    values = [(val, fuzz.ratio(string, val)) for val in iterable]
-    return str(max(values, key=operator.itemgetter(1))[0])
+def fuzz_multiple(string: str, values: utils.StrCacheSequence) -> list[str]:
+    """Fuzz a value. Returns the top matches above the score cutoff."""
+    return list(_fuzz_multiple_cached(string.casefold(), values, values.version))
 
 
-def fuzz_multiple(string: str, iterable: typing.Iterable[str]) -> list[str]:
-    """Fuzz a value."""
-    values = [(val, fuzz.partial_ratio(string, val)) for val in iterable]
-    values = sorted(values, key=operator.itemgetter(1), reverse=True)[:10]
-    values = list(map(lambda x: x[0], values))
-    return values
+@functools.lru_cache(maxsize=4096)
+def _fuzz_cached(query: str, values: utils.StrCacheSequence, version: int) -> str:
+    """Memoized fuzz_. The version invalidates entries when the cache changes."""
+    match = process.extractOne(
+        query, values.normalized, scorer=Indel.normalized_similarity
+    )
+    return values.list[match[2]]
+
+
+@functools.lru_cache(maxsize=4096)
+def _fuzz_multiple_cached(
+    query: str, values: utils.StrCacheSequence, version: int
+) -> tuple[str, ...]:
+    """Memoized fuzz_multiple. The version invalidates entries when the cache changes."""
+    matches = process.extract(
+        query,
+        values.normalized,
+        scorer=fuzz.partial_ratio,
+        limit=_FUZZ_MULTIPLE_LIMIT,
+        score_cutoff=_FUZZ_MULTIPLE_SCORE_CUTOFF,
+    )
+    return tuple(values.list[x[2]] for x in matches)
 
 
 class MapCacheData(typing.TypedDict):
@@ -59,6 +123,13 @@ class UserCacheData(typing.TypedDict):
 
 
 _RANK_THRESHOLD = (10, 10, 10, 10, 7, 3)
+_AUTO_ROLE_CONCURRENCY = 10  # Keep concurrent role edits under Discord rate limits
+
+# Role IDs for each rank tier, excluding Ninja / the placeholder
+_RANK_ROLE_IDS = tuple(utils.Roles.ranks()[1:])
+_GOLD_ROLE_IDS = tuple(utils.Roles.gold_plus()[1:])
+_SILVER_ROLE_IDS = tuple(utils.Roles.silver_plus()[1:])
+_BRONZE_ROLE_IDS = tuple(utils.Roles.bronze_plus()[1:])
 
 
 async def update_affected_users(
@@ -74,61 +145,43 @@ async def update_affected_users(
             map_code,
         )
     ]
-    if users:
-        for x in users:
-            if user := client.get_guild(utils.GUILD_ID).get_member(x):
-                await utils.auto_role(client, user)
+    if not users:
+        return
 
+    await refresh_completions_view(client)
+    guild = client.get_guild(utils.GUILD_ID)
+    semaphore = asyncio.Semaphore(_AUTO_ROLE_CONCURRENCY)
 
-async def auto_role(client: core.Genji, user: discord.Member):
-    rank, rank_plus, silver, bronze = await rank_finder(client, user)
-    rank_roles = list(
-        map(
-            lambda x: client.get_guild(utils.GUILD_ID).get_role(x),
-            utils.Roles.ranks()[1:],
-        )
-    )
-    rank_plus_roles = list(
-        map(
-            lambda x: client.get_guild(utils.GUILD_ID).get_role(x),
-            utils.Roles.gold_plus()[1:],
-        )
-    )
+    async def _update(user_id: int):
+        async with semaphore:
+            if user := guild.get_member(user_id):
+                await utils.auto_role(client, user)
 
-    rank_silver_roles = list(
-        map(
-            lambda x: client.get_guild(utils.GUILD_ID).get_role(x),
-            utils.Roles.silver_plus()[1:],
-        )
-    )
-    rank_bronze_roles = list(
-        map(
-            lambda x: client.get_guild(utils.GUILD_ID).get_role(x),
-            utils.Roles.bronze_plus()[1:],
-        )
+    await asyncio.gather(*(_update(x) for x in users))
+
+
+async def auto_role(client: core.Genji, user: discord.Member, live: bool = False):
+    """Sync a user's rank roles. Pass live to bypass user_map_completions,
+    e.g. right after one of their records changed."""
+    rank, rank_plus, silver, bronze = await rank_finder(client, user, live)
+    guild = client.get_guild(utils.GUILD_ID)
+    rank_roles = [guild.get_role(x) for x in _RANK_ROLE_IDS]
+    rank_plus_roles = [guild.get_role(x) for x in _GOLD_ROLE_IDS]
+    rank_silver_roles = [guild.get_role(x) for x in _SILVER_ROLE_IDS]
+    rank_bronze_roles = [guild.get_role(x) for x in _BRONZE_ROLE_IDS]
+
+    user_roles = set(user.roles)
+    tiers = (
+        (rank_roles, rank),
+        (rank_plus_roles, rank_plus),
+        (rank_silver_roles, silver),
+        (rank_bronze_roles, bronze),
     )
+    added = [x for roles, n in tiers for x in roles[:n] if x not in user_roles]
+    removed = [x for roles, n in tiers for x in roles[n:] if x in user_roles]
 
-    added = (
-        list(filter(lambda x: x not in user.roles, rank_roles[:rank]))
-        + list(filter(lambda x: x not in user.roles, rank_plus_roles[:rank_plus]))
-        + list(filter(lambda x: x not in user.roles, rank_silver_roles[:silver]))
-        + list(filter(lambda x: x not in user.roles, rank_bronze_roles[:bronze]))
-    )
-    removed = (
-        list(filter(lambda x: x in user.roles, rank_roles[rank:]))
-        + list(filter(lambda x: x in user.roles, rank_plus_roles[rank_plus:]))
-        + list(filter(lambda x: x in user.roles, rank_silver_roles[silver:]))
-        + list(filter(lambda x: x in user.roles, rank_bronze_roles[bronze:]))
-    )
-    new_roles = user.roles
-    for a in added:
-        if a not in new_roles:
-            new_roles.append(a)
-    for r in removed:
-        if r in new_roles:
-            new_roles.remove(r)
-
-    if set(new_roles) != set(user.roles):
+    if added or removed:
+        new_roles = list((user_roles | set(added)) - set(removed))
         await user.edit(roles=new_roles)
 
         await client.database.set(
@@ -159,9 +212,9 @@ async def auto_role(client: core.Genji, user: discord.Member):
 
 
 async def rank_finder(
-    client: core.Genji, user: discord.Member
+    client: core.Genji, user: discord.Member, live: bool = False
 ) -> tuple[int, int, int, int]:
-    amounts = await get_completions_data(client, user.id)
+    amounts = await get_completions_data(client, user.id, live=live)
     rank = 0
     gold_rank = 0
     silver_rank = 0
@@ -181,9 +234,121 @@ async def rank_finder(
     return rank, gold_rank, silver_rank, bronze_rank
 
 
+# Per (user, map) completion flags. {user_filter} narrows it for live reads.
+_USER_MAP_COMPLETIONS_SQL = """
+    WITH unioned_records AS (
+        SELECT  map_code,
+                user_id,
+                record,
+                screenshot,
+                video,
+                verified,
+                message_id,
+                channel_id,
+                NULL AS medal
+        FROM records
+        UNION
+        SELECT  map_code,
+                user_id,
+                record,
+                screenshot,
+                video,
+                TRUE AS verified,
+                message_id,
+                channel_id,
+                medal
+                FROM legacy_records
+    )
+    SELECT DISTINCT ON (m.map_code, r.user_id)
+        r.user_id,
+        m.map_code,
+        AVG(mr.difficulty)                                            AS difficulty,
+        VERIFIED = TRUE AND (record <= gold OR medal LIKE 'Gold')     AS gold,
+        VERIFIED = TRUE AND
+        (record <= silver AND record > gold OR medal LIKE 'silver')   AS silver,
+        VERIFIED = TRUE AND
+        (record <= bronze AND record > silver OR medal LIKE 'Bronze') AS bronze
+    FROM unioned_records r
+        LEFT JOIN maps m ON r.map_code = m.map_code
+        LEFT JOIN map_ratings mr ON m.map_code = mr.map_code
+        LEFT JOIN map_medals mm ON r.map_code = mm.map_code
+    WHERE m.official = TRUE
+        AND m.archived = FALSE
+        {user_filter}
+    GROUP BY m.map_code, record, gold, silver, bronze, VERIFIED, medal, r.user_id
+"""
+
+# Bump whenever _COMPLETIONS_VIEW_SQL changes so existing databases rebuild the view.
+_COMPLETIONS_VIEW_VERSION = "1"
+_COMPLETIONS_VIEW_SQL = f"""
+    DROP MATERIALIZED VIEW IF EXISTS user_map_completions;
+
+    CREATE MATERIALIZED VIEW user_map_completions AS
+    {_USER_MAP_COMPLETIONS_SQL.format(user_filter="")};
+
+    CREATE UNIQUE INDEX user_map_completions_user_id_map_code_idx
+        ON user_map_completions (user_id, map_code);
+
+    COMMENT ON MATERIALIZED VIEW user_map_completions
+        IS '{_COMPLETIONS_VIEW_VERSION}';
+"""
+
+_COMPLETIONS_REFRESH_DELAY = 10  # Seconds to batch writes into a single refresh
+_completions_refresh_pending = False
+_completions_refresh_worker: asyncio.Task | None = None
+
+
+async def setup_completions_view(client: core.Genji):
+    """Create the user_map_completions materialized view.
+    The view's comment records the _COMPLETIONS_VIEW_VERSION that built it.
+    If that doesn't match the current version, the view is dropped and rebuilt."""
+    row = await client.database.get_row(
+        """
+        SELECT obj_description(to_regclass('user_map_completions'), 'pg_class')
+            AS version;
+        """
+    )
+    if row.version != _COMPLETIONS_VIEW_VERSION:
+        await client.database.set(_COMPLETIONS_VIEW_SQL)
+
+
+async def refresh_completions_view(client: core.Genji):
+    """Refresh user_map_completions on its own connection.
+    Call before reading ranks that depend on records just written."""
+    await client.database.set(
+        "REFRESH MATERIALIZED VIEW CONCURRENTLY user_map_completions;"
+    )
+
+
+def schedule_completions_refresh(client: core.Genji):
+    """Refresh user_map_completions in the background. Returns immediately.
+    Writes within _COMPLETIONS_REFRESH_DELAY of each other share one refresh."""
+    global _completions_refresh_pending, _completions_refresh_worker
+    _completions_refresh_pending = True
+    if _completions_refresh_worker is None or _completions_refresh_worker.done():
+        _completions_refresh_worker = asyncio.create_task(
+            _completions_refresh_loop(client)
+        )
+
+
+async def _completions_refresh_loop(client: core.Genji):
+    """Refresh until no refresh is pending. A failed refresh is logged and skipped."""
+    global _completions_refresh_pending
+    while _completions_refresh_pending:
+        await asyncio.sleep(_COMPLETIONS_REFRESH_DELAY)
+        _completions_refresh_pending = False
+        try:
+            await refresh_completions_view(client)
+        except Exception:
+            client.logger.exception("Failed to refresh user_map_completions.")
+
+
 async def get_completions_data(
-    client: core.Genji, user: int, include_beginner: bool = False
+    client: core.Genji, user: int, include_beginner: bool = False, live: bool = False
 ) -> dict[str, tuple[int, int, int, int]]:
+    """Completion counts per difficulty.
+    With live, reads the user's records directly instead of user_map_completions,
+    so writes that haven't been refreshed into the view yet are included."""
     if include_beginner:
         clause = (
             "('[0.0,0.59)'::numrange, 'Beginner'), ('[0.59,2.35)'::numrange, 'Easy'),"
@@ -191,56 +356,21 @@ async def get_completions_data(
     else:
         clause = "('[0.0,2.35)'::numrange, 'Easy'),"
 
+    if live:
+        map_data = _USER_MAP_COMPLETIONS_SQL.format(user_filter="AND r.user_id = $1")
+    else:
+        map_data = "SELECT * FROM user_map_completions WHERE user_id = $1"
+
     query = f"""
-        WITH unioned_records AS (
-            SELECT  map_code,
-                    user_id,
-                    record,
-                    screenshot,
-                    video,
-                    verified,
-                    message_id,
-                    channel_id,
-                    NULL AS medal
-            FROM records
-            UNION
-            SELECT  map_code,
-                    user_id,
-                    record,
-                    screenshot,
-                    video,
-                    TRUE AS verified,
-                    message_id,
-                    channel_id,
-                    medal
-                    FROM legacy_records
-        ),
-        ranges ("range", "name") AS (
+        WITH ranges ("range", "name") AS (
              VALUES  {clause}
-                     
                      ('[2.35,4.12)'::numrange, 'Medium'),
                      ('[4.12,5.88)'::numrange, 'Hard'),
                      ('[5.88,7.65)'::numrange, 'Very Hard'),
                      ('[7.65,9.41)'::numrange, 'Extreme'),
                      ('[9.41,10.0]'::numrange, 'Hell')
         ),
-        map_data AS (
-            SELECT DISTINCT ON (m.map_code, r.user_id) 
-                AVG(mr.difficulty)                                            AS difficulty,
-                VERIFIED = TRUE AND (record <= gold OR medal LIKE 'Gold')     AS gold,
-                VERIFIED = TRUE AND
-                (record <= silver AND record > gold OR medal LIKE 'silver')   AS silver,
-                VERIFIED = TRUE AND
-                (record <= bronze AND record > silver OR medal LIKE 'Bronze') AS bronze
-            FROM unioned_records r
-                LEFT JOIN maps m ON r.map_code = m.map_code
-                LEFT JOIN map_ratings mr ON m.map_code = mr.map_code
-                LEFT JOIN map_medals mm ON r.map_code = mm.map_code
-            WHERE r.user_id = $1
-                AND m.official = TRUE
-                AND m.archived = FALSE
-            GROUP BY m.map_code, record, gold, silver, bronze, VERIFIED, medal, r.user_id
-        )
+        map_data AS ({map_data})
         SELECT COUNT(name)                        AS completions,
                name                               AS difficulty,
                COUNT(CASE WHEN gold THEN 1 END)   AS gold,
@@ -265,7 +265,7 @@ class PlaytestVoting(discord.ui.View):
         avg = row.value
         count = row.count
         func = functools.partial(self.plot, avg)
-        self.data.difficulty = utils.convert_num_to_difficulty(avg)
+        self.data.set_extras(difficulty=utils.convert_num_to_difficulty(avg))
 
         image = await itx.client.loop.run_in_executor(None, func)
         return count, image
@@ -138,7 +138,10 @@ class VerificationView(discord.ui.View):
                     search.rating,
                 )
             if search.official:
-                await utils.auto_role(itx.client, itx.guild.get_member(search.user_id))
+                await utils.auto_role(
+                    itx.client, itx.guild.get_member(search.user_id), live=True
+                )
+                utils.schedule_completions_refresh(itx.client)
         else:
             data = self.rejected(itx, search, rejection)
         await original_message.edit(content=data["edit"])